@@ -4,81 +4,205 @@ AWS Network Mapper - Collect and document AWS networking configurations
 """
 
 import boto3
-from datetime import datetime
-from typing import Dict, List, Any
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from operator import itemgetter
+from typing import Callable, Dict, List, Any
+import hashlib
+import json
+import os
 import sys
+import threading
+import time
 from markdown_formatter import MarkdownFormatter
 
+try:
+    import orjson  # Optional: faster encoding/decoding of cached responses
+except ImportError:
+    orjson = None
+
+
+# Shared by all clients: enough pooled keep-alive connections for every
+# collector running in parallel, plus adaptive retries for API throttling.
+CLIENT_CONFIG = Config(
+    max_pool_connections=32,
+    tcp_keepalive=True,
+    retries={'mode': 'adaptive', 'max_attempts': 5}
+)
+
+# Fields copied verbatim from describe responses into collected rows.
+VPC_FIELDS = ('VpcId', 'CidrBlock', 'State', 'IsDefault')
+SUBNET_FIELDS = ('SubnetId', 'VpcId', 'CidrBlock', 'AvailabilityZone', 'AvailableIpAddressCount')
+ENDPOINT_FIELDS = ('VpcEndpointId', 'VpcEndpointType', 'VpcId', 'ServiceName', 'State')
+
+# Route target fields in order of precedence; routes with none of them are local.
+ROUTE_TARGET_KEYS = (
+    'GatewayId', 'NatGatewayId', 'TransitGatewayId',
+    'NetworkInterfaceId', 'VpcPeeringConnectionId', 'InstanceId'
+)
+
+# Every instance state except 'terminated', which the report never shows.
+LIVE_INSTANCE_FILTER = {
+    'Name': 'instance-state-name',
+    'Values': ['pending', 'running', 'shutting-down', 'stopping', 'stopped']
+}
+
+# Error codes AWS uses when the credentials lack permission for a call.
+ACCESS_DENIED_CODES = ('AccessDenied', 'AccessDeniedException', 'UnauthorizedOperation')
+
+# Error codes that mean a whole region can't be queried (permissions, or an
+# opt-in region that isn't enabled for the account).
+REGION_UNAVAILABLE_CODES = ACCESS_DENIED_CODES + ('AuthFailure',)
+
+# Where describe responses are cached between runs (see --cache-ttl).
+CACHE_DIR = os.path.expanduser('~/.aws-netmapper-cache')
+
+
+def json_default(value: Any) -> str:
+    """Encode a non-JSON value: ISO 8601 for datetimes, str() for anything else."""
+    return value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+
+
+def dumps_json(value: Any) -> bytes:
+    """Serialize a describe response as compact UTF-8 JSON.
+
+    Both encoders produce the same bytes, so cache entries and --json-output
+    don't depend on whether orjson is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=json_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(value, default=json_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def loads_json(data: bytes) -> Any:
+    """Deserialize a response stored by dumps_json."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def lookup_account_id(session: boto3.Session, region: str) -> str:
+    """Return the AWS account ID of the session's credentials."""
+    sts_client = session.client('sts', region_name=region, config=CLIENT_CONFIG)
+    return sts_client.get_caller_identity()['Account']
+
 
 class AWSNetworkMapper:
     """Collects AWS networking information and formats it as markdown."""
 
-    def __init__(self, region: str = 'us-east-1', profile: str = None):
-        """Initialize AWS clients for the specified region and profile."""
-        session_args = {'region_name': region}
-        if profile:
-            session_args['profile_name'] = profile
-
-        self.session = boto3.Session(**session_args)
+    # Shared by all mappers so progress lines from parallel regions don't interleave
+    _print_lock = threading.Lock()
+
+    def __init__(self, region: str = 'us-east-1', profile: str = None,
+                 cache_ttl: int = 0, cache_dir: str = CACHE_DIR, vpc_ids: List[str] = None,
+                 session: boto3.Session = None, account_id: str = None):
+        """Initialize AWS clients for the specified region and profile.
+
+        When cache_ttl is positive, describe responses are stored under
+        cache_dir and reused for that many seconds. When vpc_ids is given,
+        VPC-scoped resources are filtered server-side to those VPCs. Pass an
+        existing session to share credential resolution between mappers;
+        boto3 sessions are not thread-safe, so create mappers on one thread.
+        Pass account_id when it is already known to skip the STS lookup.
+        """
+        if session is None:
+            session = boto3.Session(profile_name=profile) if profile else boto3.Session()
+
+        self.session = session
         self.region = region
-        self.ec2_client = self.session.client('ec2')
-        self.dx_client = self.session.client('directconnect')
+        self.cache_ttl = cache_ttl
+        self.cache_dir = cache_dir
+        self.vpc_ids = vpc_ids or []
+        self.ec2_client = self.session.client('ec2', region_name=region, config=CLIENT_CONFIG)
+        self.dx_client = self.session.client('directconnect', region_name=region, config=CLIENT_CONFIG)
+        self.account_id = account_id or lookup_account_id(self.session, region)
+
+    def log(self, message: str):
+        """Print a progress message without interleaving output across threads."""
+        with self._print_lock:
+            print(message)
+
+    def cached_call(self, api_name: str, fn: Callable[..., Any], **kwargs) -> Any:
+        """Return fn(**kwargs), reusing a cached result younger than cache_ttl seconds."""
+        if self.cache_ttl <= 0:
+            return fn(**kwargs)
+
+        key = json.dumps([self.region, self.account_id, api_name, kwargs], sort_keys=True, default=str)
+        path = os.path.join(self.cache_dir, hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+        try:
+            if time.time() - os.path.getmtime(path) < self.cache_ttl:
+                with open(path, 'rb') as f:
+                    return loads_json(f.read())
+        except (OSError, ValueError):
+            pass  # Missing, expired or unreadable entry: fetch fresh data
+
+        result = fn(**kwargs)
+
+        try:
+            # Responses hold the account's network inventory: keep them private
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, 'wb') as f:
+                f.write(dumps_json(result))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.log(f"Warning: Could not write cache entry for {api_name}: {e}")
+
+        return result
+
+    def paginate(self, client, operation: str, result_key: str, **kwargs) -> List[Dict[str, Any]]:
+        """Return every item of a describe call, following NextToken across pages."""
+        def fetch(**params):
+            paginator = client.get_paginator(operation)
+            return [item for page in paginator.paginate(**params) for item in page.get(result_key, [])]
+
+        return self.cached_call(operation, fetch, **kwargs)
+
+    def vpc_filters(self, name: str = 'vpc-id') -> List[Dict[str, Any]]:
+        """Build EC2 Filters limiting results to the selected VPCs (empty when unscoped)."""
+        return [{'Name': name, 'Values': self.vpc_ids}] if self.vpc_ids else []
 
     def get_tag_value(self, tags: List[Dict], key: str) -> str:
         """Extract tag value from AWS tags list."""
-        if not tags:
-            return ''
-        for tag in tags:
-            if tag.get('Key') == key:
-                return tag.get('Value', '')
-        return ''
+        return next((tag.get('Value', '') for tag in tags or () if tag.get('Key') == key), '')
+
+    def get_name(self, resource: Dict[str, Any]) -> str:
+        """Return the Name tag of an AWS resource, or '' if it has none."""
+        return self.get_tag_value(resource.get('Tags'), 'Name')
 
     def collect_vpcs(self) -> List[Dict[str, Any]]:
         """Collect VPC information."""
-        print("Collecting VPCs...")
-        response = self.ec2_client.describe_vpcs()
-        vpcs = []
-
-        for vpc in response.get('Vpcs', []):
-            vpcs.append({
-                'VpcId': vpc['VpcId'],
-                'Name': self.get_tag_value(vpc.get('Tags', []), 'Name'),
-                'CidrBlock': vpc['CidrBlock'],
-                'State': vpc['State'],
-                'IsDefault': vpc['IsDefault']
-            })
+        self.log("Collecting VPCs...")
+        get_fields = itemgetter(*VPC_FIELDS)
+        vpcs = [
+            dict(zip(VPC_FIELDS, get_fields(vpc)), Name=self.get_name(vpc))
+            for vpc in self.paginate(self.ec2_client, 'describe_vpcs', 'Vpcs', Filters=self.vpc_filters())
+        ]
 
         return vpcs
 
     def collect_subnets(self) -> List[Dict[str, Any]]:
         """Collect subnet information."""
-        print("Collecting Subnets...")
-        response = self.ec2_client.describe_subnets()
-        subnets = []
-
-        for subnet in response.get('Subnets', []):
-            # Determine if subnet is public or private by checking route table
-            subnet_type = 'Private'  # Default assumption
-
-            subnets.append({
-                'SubnetId': subnet['SubnetId'],
-                'Name': self.get_tag_value(subnet.get('Tags', []), 'Name'),
-                'VpcId': subnet['VpcId'],
-                'CidrBlock': subnet['CidrBlock'],
-                'AvailabilityZone': subnet['AvailabilityZone'],
-                'AvailableIpAddressCount': subnet['AvailableIpAddressCount'],
-                'Type': subnet_type
-            })
+        self.log("Collecting Subnets...")
+        get_fields = itemgetter(*SUBNET_FIELDS)
+        # Subnets are reported as private until route tables are checked
+        subnets = [
+            dict(zip(SUBNET_FIELDS, get_fields(subnet)), Name=self.get_name(subnet), Type='Private')
+            for subnet in self.paginate(self.ec2_client, 'describe_subnets', 'Subnets', Filters=self.vpc_filters())
+        ]
 
         return subnets
 
     def collect_route_tables(self) -> List[Dict[str, Any]]:
         """Collect route table information."""
-        print("Collecting Route Tables...")
-        response = self.ec2_client.describe_route_tables()
+        self.log("Collecting Route Tables...")
         route_tables = []
 
-        for rt in response.get('RouteTables', []):
+        for rt in self.paginate(self.ec2_client, 'describe_route_tables', 'RouteTables', Filters=self.vpc_filters()):
             # Get associated subnets
             associations = rt.get('Associations', [])
             subnet_ids = [assoc['SubnetId'] for assoc in associations if 'SubnetId' in assoc]
@@ -88,32 +212,19 @@ class AWSNetworkMapper:
             routes = rt.get('Routes', [])
             key_routes = []
             for route in routes:
-                dest = route.get('DestinationCidrBlock', route.get('DestinationPrefixListId', 'N/A'))
-
-                if 'GatewayId' in route:
-                    target = route['GatewayId']
-                elif 'NatGatewayId' in route:
-                    target = route['NatGatewayId']
-                elif 'TransitGatewayId' in route:
-                    target = route['TransitGatewayId']
-                elif 'NetworkInterfaceId' in route:
-                    target = route['NetworkInterfaceId']
-                elif 'VpcPeeringConnectionId' in route:
-                    target = route['VpcPeeringConnectionId']
-                elif 'InstanceId' in route:
-                    target = route['InstanceId']
-                else:
-                    target = 'local'
-
-                state = route.get('State', 'active')
-                if state == 'blackhole':
+                cidr = route.get('DestinationCidrBlock')
+                dest = cidr or route.get('DestinationPrefixListId') or 'N/A'
+                target = next((route[key] for key in ROUTE_TARGET_KEYS if key in route), 'local')
+
+                if route.get('State') == 'blackhole':
                     key_routes.append(f"{dest} → {target} (blackhole)")
-                elif dest != route.get('DestinationCidrBlock') or target != 'local':
+                elif dest != cidr or target != 'local':
+                    # Everything except the implicit local route for a VPC CIDR
                     key_routes.append(f"{dest} → {target}")
 
             route_tables.append({
                 'RouteTableId': rt['RouteTableId'],
-                'Name': self.get_tag_value(rt.get('Tags', []), 'Name'),
+                'Name': self.get_name(rt),
                 'VpcId': rt['VpcId'],
                 'SubnetIds': subnet_ids,
                 'IsMain': is_main,
@@ -124,18 +235,20 @@ class AWSNetworkMapper:
 
     def collect_internet_gateways(self) -> List[Dict[str, Any]]:
         """Collect Internet Gateway information."""
-        print("Collecting Internet Gateways...")
-        response = self.ec2_client.describe_internet_gateways()
+        self.log("Collecting Internet Gateways...")
         igws = []
 
-        for igw in response.get('InternetGateways', []):
+        for igw in self.paginate(
+            self.ec2_client, 'describe_internet_gateways', 'InternetGateways',
+            Filters=self.vpc_filters('attachment.vpc-id')
+        ):
             attachments = igw.get('Attachments', [])
             attached_vpc = attachments[0]['VpcId'] if attachments else 'Not attached'
             state = attachments[0]['State'] if attachments else 'detached'
 
             igws.append({
                 'InternetGatewayId': igw['InternetGatewayId'],
-                'Name': self.get_tag_value(igw.get('Tags', []), 'Name'),
+                'Name': self.get_name(igw),
                 'State': state,
                 'AttachedVpc': attached_vpc
             })
@@ -144,18 +257,17 @@ class AWSNetworkMapper:
 
     def collect_nat_gateways(self) -> List[Dict[str, Any]]:
         """Collect NAT Gateway information."""
-        print("Collecting NAT Gateways...")
-        response = self.ec2_client.describe_nat_gateways()
+        self.log("Collecting NAT Gateways...")
         nat_gws = []
 
-        for nat in response.get('NatGateways', []):
+        for nat in self.paginate(self.ec2_client, 'describe_nat_gateways', 'NatGateways', Filter=self.vpc_filters()):
             addresses = nat.get('NatGatewayAddresses', [])
             public_ip = addresses[0].get('PublicIp', 'N/A') if addresses else 'N/A'
             private_ip = addresses[0].get('PrivateIp', 'N/A') if addresses else 'N/A'
 
             nat_gws.append({
                 'NatGatewayId': nat['NatGatewayId'],
-                'Name': self.get_tag_value(nat.get('Tags', []), 'Name'),
+                'Name': self.get_name(nat),
                 'VpcId': nat['VpcId'],
                 'SubnetId': nat['SubnetId'],
                 'State': nat['State'],
@@ -167,16 +279,15 @@ class AWSNetworkMapper:
 
     def collect_transit_gateways(self) -> List[Dict[str, Any]]:
         """Collect Transit Gateway information."""
-        print("Collecting Transit Gateways...")
-        response = self.ec2_client.describe_transit_gateways()
+        self.log("Collecting Transit Gateways...")
         tgws = []
 
-        for tgw in response.get('TransitGateways', []):
+        for tgw in self.paginate(self.ec2_client, 'describe_transit_gateways', 'TransitGateways'):
             options = tgw.get('Options', {})
 
             tgws.append({
                 'TransitGatewayId': tgw['TransitGatewayId'],
-                'Name': self.get_tag_value(tgw.get('Tags', []), 'Name'),
+                'Name': self.get_name(tgw),
                 'State': tgw['State'],
                 'AmazonSideAsn': options.get('AmazonSideAsn', 'N/A'),
                 'DefaultRouteTableId': options.get('AssociationDefaultRouteTableId', 'N/A')
@@ -186,8 +297,11 @@ class AWSNetworkMapper:
 
     def collect_vpn_gateways(self) -> List[Dict[str, Any]]:
         """Collect VPN Gateway information."""
-        print("Collecting VPN Gateways...")
-        response = self.ec2_client.describe_vpn_gateways()
+        self.log("Collecting VPN Gateways...")
+        response = self.cached_call(
+            'describe_vpn_gateways', self.ec2_client.describe_vpn_gateways,
+            Filters=self.vpc_filters('attachment.vpc-id')
+        )
         vgws = []
 
         for vgw in response.get('VpnGateways', []):
@@ -196,7 +310,7 @@ class AWSNetworkMapper:
 
             vgws.append({
                 'VpnGatewayId': vgw['VpnGatewayId'],
-                'Name': self.get_tag_value(vgw.get('Tags', []), 'Name'),
+                'Name': self.get_name(vgw),
                 'State': vgw['State'],
                 'Type': vgw['Type'],
                 'AmazonSideAsn': vgw.get('AmazonSideAsn', 'N/A'),
@@ -207,14 +321,13 @@ class AWSNetworkMapper:
 
     def collect_security_groups(self) -> List[Dict[str, Any]]:
         """Collect Security Group information."""
-        print("Collecting Security Groups...")
-        response = self.ec2_client.describe_security_groups()
+        self.log("Collecting Security Groups...")
         sgs = []
 
-        for sg in response.get('SecurityGroups', []):
+        for sg in self.paginate(self.ec2_client, 'describe_security_groups', 'SecurityGroups', Filters=self.vpc_filters()):
             # Summarize inbound rules
             inbound_rules = []
-            for rule in sg.get('IpPermissions', [])[:5]:  # Limit to first 5 rules
+            for rule in sg.get('IpPermissions', ()):
                 protocol = rule.get('IpProtocol', 'All')
                 if protocol == '-1':
                     protocol = 'All'
@@ -224,11 +337,8 @@ class AWSNetworkMapper:
                 port_range = f"{from_port}" if from_port == to_port else f"{from_port}-{to_port}"
 
                 # Get source
-                sources = []
-                for ip_range in rule.get('IpRanges', []):
-                    sources.append(ip_range.get('CidrIp', ''))
-                for sg_ref in rule.get('UserIdGroupPairs', []):
-                    sources.append(sg_ref.get('GroupId', 'self'))
+                sources = [ip_range.get('CidrIp', '') for ip_range in rule.get('IpRanges', ())]
+                sources += [sg_ref.get('GroupId', 'self') for sg_ref in rule.get('UserIdGroupPairs', ())]
 
                 source = ', '.join(sources) if sources else 'All'
                 inbound_rules.append(f"{protocol}/{port_range} from {source}")
@@ -244,11 +354,10 @@ class AWSNetworkMapper:
 
     def collect_network_acls(self) -> List[Dict[str, Any]]:
         """Collect Network ACL information."""
-        print("Collecting Network ACLs...")
-        response = self.ec2_client.describe_network_acls()
+        self.log("Collecting Network ACLs...")
         nacls = []
 
-        for nacl in response.get('NetworkAcls', []):
+        for nacl in self.paginate(self.ec2_client, 'describe_network_acls', 'NetworkAcls', Filters=self.vpc_filters()):
             associations = nacl.get('Associations', [])
             subnet_ids = [assoc['SubnetId'] for assoc in associations]
 
@@ -268,17 +377,29 @@ class AWSNetworkMapper:
 
     def collect_vpc_peering(self) -> List[Dict[str, Any]]:
         """Collect VPC Peering Connection information."""
-        print("Collecting VPC Peering Connections...")
-        response = self.ec2_client.describe_vpc_peering_connections()
+        self.log("Collecting VPC Peering Connections...")
         peerings = []
 
-        for peer in response.get('VpcPeeringConnections', []):
+        # Filters are ANDed, so the requester and accepter sides need separate queries
+        if self.vpc_ids:
+            filter_sets = [self.vpc_filters('requester-vpc-info.vpc-id'), self.vpc_filters('accepter-vpc-info.vpc-id')]
+        else:
+            filter_sets = [[]]
+
+        unique_peers = {}
+        for filters in filter_sets:
+            for peer in self.paginate(
+                self.ec2_client, 'describe_vpc_peering_connections', 'VpcPeeringConnections', Filters=filters
+            ):
+                unique_peers[peer['VpcPeeringConnectionId']] = peer
+
+        for peer in unique_peers.values():
             requester = peer.get('RequesterVpcInfo', {})
             accepter = peer.get('AccepterVpcInfo', {})
 
             peerings.append({
                 'VpcPeeringConnectionId': peer['VpcPeeringConnectionId'],
-                'Name': self.get_tag_value(peer.get('Tags', []), 'Name'),
+                'Name': self.get_name(peer),
                 'RequesterVpc': f"{requester.get('VpcId', 'N/A')} ({requester.get('CidrBlock', 'N/A')})",
                 'AccepterVpc': f"{accepter.get('VpcId', 'N/A')} ({accepter.get('CidrBlock', 'N/A')})",
                 'Status': peer['Status']['Code']
@@ -288,29 +409,24 @@ class AWSNetworkMapper:
 
     def collect_vpc_endpoints(self) -> List[Dict[str, Any]]:
         """Collect VPC Endpoint information."""
-        print("Collecting VPC Endpoints...")
-        response = self.ec2_client.describe_vpc_endpoints()
-        endpoints = []
-
-        for endpoint in response.get('VpcEndpoints', []):
-            endpoints.append({
-                'VpcEndpointId': endpoint['VpcEndpointId'],
-                'Name': self.get_tag_value(endpoint.get('Tags', []), 'Name'),
-                'VpcEndpointType': endpoint['VpcEndpointType'],
-                'VpcId': endpoint['VpcId'],
-                'ServiceName': endpoint['ServiceName'],
-                'State': endpoint['State']
-            })
+        self.log("Collecting VPC Endpoints...")
+        get_fields = itemgetter(*ENDPOINT_FIELDS)
+        endpoints = [
+            dict(zip(ENDPOINT_FIELDS, get_fields(endpoint)), Name=self.get_name(endpoint))
+            for endpoint in self.paginate(self.ec2_client, 'describe_vpc_endpoints', 'VpcEndpoints', Filters=self.vpc_filters())
+        ]
 
         return endpoints
 
     def collect_ec2_instances(self) -> List[Dict[str, Any]]:
         """Collect EC2 instance information."""
-        print("Collecting EC2 Instances...")
-        response = self.ec2_client.describe_instances()
+        self.log("Collecting EC2 Instances...")
         instances = []
 
-        for reservation in response.get('Reservations', []):
+        for reservation in self.paginate(
+            self.ec2_client, 'describe_instances', 'Reservations',
+            Filters=self.vpc_filters() + [LIVE_INSTANCE_FILTER]
+        ):
             for instance in reservation.get('Instances', []):
                 # Get network interfaces info
                 network_interfaces = instance.get('NetworkInterfaces', [])
@@ -325,7 +441,7 @@ class AWSNetworkMapper:
 
                 instances.append({
                     'InstanceId': instance['InstanceId'],
-                    'Name': self.get_tag_value(instance.get('Tags', []), 'Name'),
+                    'Name': self.get_name(instance),
                     'InstanceType': instance['InstanceType'],
                     'State': instance['State']['Name'],
                     'VpcId': instance.get('VpcId', 'N/A'),
@@ -342,52 +458,72 @@ class AWSNetworkMapper:
 
     def collect_direct_connect(self) -> Dict[str, Any]:
         """Collect Direct Connect information."""
-        print("Collecting Direct Connect configurations...")
+        self.log("Collecting Direct Connect configurations...")
 
         try:
-            # Get connections
-            connections = self.dx_client.describe_connections().get('connections', [])
-
-            # Get virtual interfaces
-            vifs = self.dx_client.describe_virtual_interfaces().get('virtualInterfaces', [])
-
-            # Get Direct Connect gateways
-            dx_gateways = self.dx_client.describe_direct_connect_gateways().get('directConnectGateways', [])
-
-            return {
-                'connections': connections,
-                'virtual_interfaces': vifs,
-                'dx_gateways': dx_gateways
-            }
-        except Exception as e:
-            print(f"Warning: Could not collect Direct Connect info: {e}")
+            # The three DX describe calls are independent, so fetch them together
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                connections = executor.submit(
+                    self.cached_call, 'describe_connections', self.dx_client.describe_connections
+                )
+                vifs = executor.submit(
+                    self.cached_call, 'describe_virtual_interfaces', self.dx_client.describe_virtual_interfaces
+                )
+                dx_gateways = executor.submit(
+                    self.cached_call, 'describe_direct_connect_gateways', self.dx_client.describe_direct_connect_gateways
+                )
+
+                return {
+                    'connections': connections.result().get('connections', []),
+                    'virtual_interfaces': vifs.result().get('virtualInterfaces', []),
+                    'dx_gateways': dx_gateways.result().get('directConnectGateways', [])
+                }
+        except ClientError as e:
+            # Missing Direct Connect permissions shouldn't fail the whole run
+            if e.response['Error']['Code'] not in ACCESS_DENIED_CODES:
+                raise
+            self.log(f"Warning: Could not collect Direct Connect info: {e}")
             return {'connections': [], 'virtual_interfaces': [], 'dx_gateways': []}
 
     def collect_all(self) -> Dict[str, Any]:
-        """Collect all networking information."""
-        print(f"\nCollecting AWS Network Configuration for region: {self.region}\n")
+        """Collect all networking information.
+
+        Each collector blocks on independent AWS API calls, so they are run
+        concurrently and gathered once all of them have finished.
+        """
+        self.log(f"\nCollecting AWS Network Configuration for region: {self.region}\n")
+
+        collectors = {
+            'vpcs': self.collect_vpcs,
+            'subnets': self.collect_subnets,
+            'route_tables': self.collect_route_tables,
+            'internet_gateways': self.collect_internet_gateways,
+            'nat_gateways': self.collect_nat_gateways,
+            'transit_gateways': self.collect_transit_gateways,
+            'vpn_gateways': self.collect_vpn_gateways,
+            'security_groups': self.collect_security_groups,
+            'network_acls': self.collect_network_acls,
+            'vpc_peering': self.collect_vpc_peering,
+            'vpc_endpoints': self.collect_vpc_endpoints,
+            'ec2_instances': self.collect_ec2_instances,
+            'direct_connect': self.collect_direct_connect
+        }
 
-        return {
+        data = {
             'metadata': {
                 'region': self.region,
                 'date': datetime.now().strftime('%Y-%m-%d'),
-                'account_id': self.session.client('sts').get_caller_identity()['Account']
-            },
-            'vpcs': self.collect_vpcs(),
-            'subnets': self.collect_subnets(),
-            'route_tables': self.collect_route_tables(),
-            'internet_gateways': self.collect_internet_gateways(),
-            'nat_gateways': self.collect_nat_gateways(),
-            'transit_gateways': self.collect_transit_gateways(),
-            'vpn_gateways': self.collect_vpn_gateways(),
-            'security_groups': self.collect_security_groups(),
-            'network_acls': self.collect_network_acls(),
-            'vpc_peering': self.collect_vpc_peering(),
-            'vpc_endpoints': self.collect_vpc_endpoints(),
-            'ec2_instances': self.collect_ec2_instances(),
-            'direct_connect': self.collect_direct_connect()
+                'account_id': self.account_id
+            }
         }
 
+        with ThreadPoolExecutor(max_workers=len(collectors)) as executor:
+            futures = {key: executor.submit(fn) for key, fn in collectors.items()}
+            for key, future in futures.items():
+                data[key] = future.result()
+
+        return data
+
 
 def main():
     """Main execution function."""
@@ -401,6 +537,10 @@ def main():
         default='us-east-1',
         help='AWS region to query (default: us-east-1)'
     )
+    parser.add_argument(
+        '--regions',
+        help='Comma-separated list of regions to query in parallel (overrides --region)'
+    )
     parser.add_argument(
         '--profile',
         help='AWS profile to use (default: default profile)'
@@ -410,38 +550,101 @@ def main():
         default='network-config.md',
         help='Output file path (default: network-config.md)'
     )
+    parser.add_argument(
+        '--json-output',
+        help='Also write the collected data as JSON to this path'
+    )
+    parser.add_argument(
+        '--vpc-id',
+        dest='vpc_ids',
+        nargs='+',
+        metavar='VPC_ID',
+        help='Only report resources in these VPCs (default: all VPCs)'
+    )
+    parser.add_argument(
+        '--cache-ttl',
+        type=int,
+        default=300,
+        help='Seconds to reuse cached AWS responses, 0 disables caching (default: 300)'
+    )
 
     args = parser.parse_args()
 
-    try:
-        # Initialize mapper
-        mapper = AWSNetworkMapper(region=args.region, profile=args.profile)
+    if args.regions is not None:
+        # Keep the requested order but collect each region only once
+        regions = list(dict.fromkeys(r.strip() for r in args.regions.split(',') if r.strip()))
+        if not regions:
+            parser.error('--regions needs at least one region name')
+    else:
+        regions = [args.region]
 
-        # Collect data
-        data = mapper.collect_all()
+    try:
+        session = boto3.Session(profile_name=args.profile) if args.profile else boto3.Session()
+
+        # One STS round trip per run, made from the session's own region so an
+        # opt-in region in --regions can't fail it; bad credentials still stop here
+        account_id = lookup_account_id(session, session.region_name or args.region)
+
+        # Initialize one mapper per region; clients are built here because the
+        # shared session must not be used from several threads at once
+        mappers = [
+            AWSNetworkMapper(
+                region=region,
+                session=session,
+                cache_ttl=args.cache_ttl,
+                vpc_ids=args.vpc_ids,
+                account_id=account_id
+            )
+            for region in regions
+        ]
+
+        # Collect data for all regions concurrently; a region we can't query
+        # is left out of the report instead of failing the whole batch
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(mappers)) as executor:
+            futures = {mapper.region: executor.submit(mapper.collect_all) for mapper in mappers}
+            for region, future in futures.items():
+                try:
+                    results[region] = future.result()
+                except ClientError as e:
+                    if e.response['Error']['Code'] not in REGION_UNAVAILABLE_CODES:
+                        raise
+                    print(f"Warning: Skipping region {region}: {e}", file=sys.stderr)
+
+        if not results:
+            raise RuntimeError("No region could be queried")
 
         print(f"\n✓ Data collection complete!")
-        print(f"Total resources found:")
-        print(f"  - VPCs: {len(data['vpcs'])}")
-        print(f"  - Subnets: {len(data['subnets'])}")
-        print(f"  - Route Tables: {len(data['route_tables'])}")
-        print(f"  - Internet Gateways: {len(data['internet_gateways'])}")
-        print(f"  - NAT Gateways: {len(data['nat_gateways'])}")
-        print(f"  - Transit Gateways: {len(data['transit_gateways'])}")
-        print(f"  - EC2 Instances: {len(data['ec2_instances'])}")
-        print(f"  - Security Groups: {len(data['security_groups'])}")
+        for region, data in results.items():
+            print(f"Total resources found in {region}:")
+            print(f"  - VPCs: {len(data['vpcs'])}")
+            print(f"  - Subnets: {len(data['subnets'])}")
+            print(f"  - Route Tables: {len(data['route_tables'])}")
+            print(f"  - Internet Gateways: {len(data['internet_gateways'])}")
+            print(f"  - NAT Gateways: {len(data['nat_gateways'])}")
+            print(f"  - Transit Gateways: {len(data['transit_gateways'])}")
+            print(f"  - EC2 Instances: {len(data['ec2_instances'])}")
+            print(f"  - Security Groups: {len(data['security_groups'])}")
+
+        if args.json_output:
+            with open(args.json_output, 'wb') as f:
+                f.write(dumps_json({'regions': results}))
+            print(f"\n✓ Raw data written to: {args.json_output}")
 
         # Format to markdown
         print(f"\nFormatting output to markdown...")
         formatter = MarkdownFormatter()
-        markdown_output = formatter.format_all(data)
 
-        # Write to file
-        with open(args.output, 'w') as f:
-            f.write(markdown_output)
+        # Write straight to the file rather than building the document in memory
+        # (one document section per region, in the order requested)
+        with open(args.output, 'w', buffering=1 << 20) as f:
+            for i, data in enumerate(results.values()):
+                if i:
+                    f.write("\n")
+                formatter.format_all(data, out=f)
 
         print(f"\n✓ Network configuration written to: {args.output}")
-        print(f"  File size: {len(markdown_output)} characters")
+        print(f"  File size: {os.path.getsize(args.output)} bytes")
 
     except Exception as e:
         print(f"\n✗ Error: {e}", file=sys.stderr)
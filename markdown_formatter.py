@@ -2,93 +2,213 @@
 Markdown formatter for AWS Network Configuration data
 """
 
-from typing import Dict, List, Any
+import functools
+import io
+from typing import Callable, Dict, List, Any, Optional, Sequence, TextIO
+
+
+# Placeholder shown for resources without a Name tag.
+UNNAMED = '(unnamed)'
+
+# Sections whose rows map one-to-one onto collected resources:
+# key in the collected data -> (table headers, function building one row)
+SECTION_SPECS = {
+    'vpcs': (
+        ("VPC ID", "Name", "CIDR Block", "State", "Default"),
+        lambda vpc: [
+            vpc['VpcId'],
+            vpc['Name'] or UNNAMED,
+            vpc['CidrBlock'],
+            vpc['State'],
+            'Yes' if vpc['IsDefault'] else 'No'
+        ]
+    ),
+    'subnets': (
+        ("Subnet ID", "Name", "VPC", "CIDR Block", "AZ", "Available IPs", "Type"),
+        lambda subnet: [
+            subnet['SubnetId'],
+            subnet['Name'] or UNNAMED,
+            subnet['VpcId'],
+            subnet['CidrBlock'],
+            subnet['AvailabilityZone'],
+            str(subnet['AvailableIpAddressCount']),
+            subnet['Type']
+        ]
+    ),
+    'internet_gateways': (
+        ("IGW ID", "Name", "State", "Attached VPC"),
+        lambda igw: [
+            igw['InternetGatewayId'],
+            igw['Name'] or UNNAMED,
+            igw['State'],
+            igw['AttachedVpc']
+        ]
+    ),
+    'nat_gateways': (
+        ("NAT Gateway ID", "Name", "VPC", "Subnet", "State", "Public IP", "Private IP"),
+        lambda nat: [
+            nat['NatGatewayId'],
+            nat['Name'] or UNNAMED,
+            nat['VpcId'],
+            nat['SubnetId'],
+            nat['State'],
+            nat['PublicIp'],
+            nat['PrivateIp']
+        ]
+    ),
+    'transit_gateways': (
+        ("TGW ID", "Name", "State", "ASN", "Default Route Table"),
+        lambda tgw: [
+            tgw['TransitGatewayId'],
+            tgw['Name'] or UNNAMED,
+            tgw['State'],
+            str(tgw['AmazonSideAsn']),
+            tgw['DefaultRouteTableId']
+        ]
+    ),
+    'vpn_gateways': (
+        ("VGW ID", "Name", "State", "Type", "ASN", "Attached VPC"),
+        lambda vgw: [
+            vgw['VpnGatewayId'],
+            vgw['Name'] or UNNAMED,
+            vgw['State'],
+            vgw['Type'],
+            str(vgw['AmazonSideAsn']),
+            vgw['AttachedVpc']
+        ]
+    ),
+    'vpc_peering': (
+        ("Peering Connection ID", "Name", "Requester VPC", "Accepter VPC", "Status"),
+        lambda peer: [
+            peer['VpcPeeringConnectionId'],
+            peer['Name'] or UNNAMED,
+            peer['RequesterVpc'],
+            peer['AccepterVpc'],
+            peer['Status']
+        ]
+    ),
+    'vpc_endpoints': (
+        ("Endpoint ID", "Name", "Type", "VPC", "Service", "State"),
+        lambda endpoint: [
+            endpoint['VpcEndpointId'],
+            endpoint['Name'] or UNNAMED,
+            endpoint['VpcEndpointType'],
+            endpoint['VpcId'],
+            short_service_name(endpoint['ServiceName']),
+            endpoint['State']
+        ]
+    ),
+}
+
+# Table headers for the sections with their own format_* method.
+ROUTE_TABLE_HEADERS = ("Route Table ID", "Name", "VPC", "Associated Subnets", "Key Routes")
+SECURITY_GROUP_HEADERS = ("SG ID", "Name", "VPC", "Key Inbound Rules")
+NETWORK_ACL_HEADERS = ("NACL ID", "VPC", "Subnets", "Type", "Rules")
+EC2_INSTANCE_HEADERS = ("Instance ID", "Name", "Type", "State", "VPC", "Subnet", "Private IP", "Public IP", "NAT Instance")
+DX_CONNECTION_HEADERS = ("Connection ID", "Name", "State", "Location", "Bandwidth", "AWS Device")
+DX_VIF_HEADERS = ("VIF ID", "Name", "Type", "VLAN", "State", "BGP Status", "Customer ASN")
+DX_GATEWAY_HEADERS = ("DX Gateway ID", "Name", "State", "ASN")
+
+# Instance states left out of the EC2 table.
+TERMINATED_STATES = frozenset(('terminated', 'terminating'))
+
+
+@functools.lru_cache(maxsize=256)
+def short_service_name(service_name: str) -> str:
+    """Drop the com.amazonaws. prefix from an endpoint service name for readability.
+
+    Accounts tend to have many endpoints for a handful of services, so
+    results are memoized.
+    """
+    return service_name.replace('com.amazonaws.', '', 1)
+
+
+def join_truncated(items: List[str], sep: str, limit: int = 3, more: str = " (+{} more)") -> str:
+    """Join at most `limit` items, appending `more` with the count of items left out."""
+    total = len(items)
+    if total <= limit:
+        return sep.join(items)
+    return sep.join(items[:limit]) + more.format(total - limit)
+
+
+def writes_markdown(method: Callable) -> Callable:
+    """Let a format_* method write to an `out` file object or return a string.
+
+    The decorated method always writes to its `out` argument. Callers that
+    pass out=None get the text back as a string, built in a StringIO.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, out: Optional[TextIO] = None, **kwargs) -> Optional[str]:
+        if out is not None:
+            method(*args, out=out, **kwargs)
+            return None
+
+        buf = io.StringIO()
+        method(*args, out=buf, **kwargs)
+        return buf.getvalue()
+
+    return wrapper
 
 
 class MarkdownFormatter:
     """Formats AWS networking data as markdown tables and sections."""
 
     @staticmethod
-    def format_table(headers: List[str], rows: List[List[str]]) -> str:
-        """Format data as a markdown table."""
+    @writes_markdown
+    def format_table(headers: Sequence[str], rows: List[List[str]], *, out: TextIO):
+        """Format data as a markdown table. Every cell must already be a string."""
         if not rows:
-            return "_No resources found_\n"
+            out.write("_No resources found_\n")
+            return
 
-        # Calculate column widths
-        col_widths = [len(h) for h in headers]
-        for row in rows:
-            for i, cell in enumerate(row):
-                col_widths[i] = max(col_widths[i], len(str(cell)))
+        # Measure each column in a single pass
+        col_widths = [max(len(h), max(map(len, col))) for h, col in zip(headers, zip(*rows))]
 
-        # Build table
-        lines = []
-
-        # Header row
-        header_row = "| " + " | ".join(h.ljust(col_widths[i]) for i, h in enumerate(headers)) + " |"
-        lines.append(header_row)
-
-        # Separator row
+        # Build one padded row template for the whole table
+        row_template = "| " + " | ".join("%%-%ds" % w for w in col_widths) + " |"
         separator = "|-" + "-|-".join("-" * w for w in col_widths) + "-|"
-        lines.append(separator)
 
-        # Data rows
-        for row in rows:
-            data_row = "| " + " | ".join(str(cell).ljust(col_widths[i]) for i, cell in enumerate(row)) + " |"
-            lines.append(data_row)
+        lines = [row_template % tuple(headers), separator]
+        lines.extend([row_template % tuple(row) for row in rows])
+        lines.append("")  # Trailing newline after the last row
 
-        return "\n".join(lines) + "\n"
-
-    def format_vpcs(self, vpcs: List[Dict[str, Any]]) -> str:
-        """Format VPC information."""
-        headers = ["VPC ID", "Name", "CIDR Block", "State", "Default"]
-        rows = []
+        out.write("\n".join(lines))
 
-        for vpc in vpcs:
-            rows.append([
-                vpc['VpcId'],
-                vpc['Name'] or '(unnamed)',
-                vpc['CidrBlock'],
-                vpc['State'],
-                'Yes' if vpc['IsDefault'] else 'No'
-            ])
+    @writes_markdown
+    def format_section(self, key: str, items: List[Dict[str, Any]], *, out: TextIO):
+        """Format one of the one-row-per-resource sections described in SECTION_SPECS."""
+        headers, make_row = SECTION_SPECS[key]
+        self.format_table(headers, [make_row(item) for item in items], out=out)
 
-        return self.format_table(headers, rows)
+    @writes_markdown
+    def format_vpcs(self, vpcs: List[Dict[str, Any]], *, out: TextIO):
+        """Format VPC information."""
+        self.format_section('vpcs', vpcs, out=out)
 
-    def format_subnets(self, subnets: List[Dict[str, Any]]) -> str:
+    @writes_markdown
+    def format_subnets(self, subnets: List[Dict[str, Any]], *, out: TextIO):
         """Format subnet information."""
-        headers = ["Subnet ID", "Name", "VPC", "CIDR Block", "AZ", "Available IPs", "Type"]
-        rows = []
-
-        for subnet in subnets:
-            rows.append([
-                subnet['SubnetId'],
-                subnet['Name'] or '(unnamed)',
-                subnet['VpcId'],
-                subnet['CidrBlock'],
-                subnet['AvailabilityZone'],
-                str(subnet['AvailableIpAddressCount']),
-                subnet['Type']
-            ])
+        self.format_section('subnets', subnets, out=out)
 
-        return self.format_table(headers, rows)
-
-    def format_route_tables(self, route_tables: List[Dict[str, Any]]) -> str:
+    @writes_markdown
+    def format_route_tables(self, route_tables: List[Dict[str, Any]], *, out: TextIO):
         """Format route table information."""
-        headers = ["Route Table ID", "Name", "VPC", "Associated Subnets", "Key Routes"]
         rows = []
 
         for rt in route_tables:
-            name = rt['Name'] or '(unnamed)'
-            if rt['IsMain']:
+            is_main = rt['IsMain']
+            subnet_ids = rt['SubnetIds']
+
+            name = rt['Name'] or UNNAMED
+            if is_main:
                 name += ' (Main)'
 
-            subnet_info = 'Main route table' if rt['IsMain'] and not rt['SubnetIds'] else ', '.join(rt['SubnetIds'][:3])
-            if len(rt['SubnetIds']) > 3:
-                subnet_info += f", (+{len(rt['SubnetIds']) - 3} more)"
+            if is_main and not subnet_ids:
+                subnet_info = 'Main route table'
+            else:
+                subnet_info = join_truncated(subnet_ids, ', ', more=", (+{} more)")
 
-            key_routes = '; '.join(rt['KeyRoutes'][:3]) if rt['KeyRoutes'] else 'Local only'
-            if len(rt['KeyRoutes']) > 3:
-                key_routes += f" (+{len(rt['KeyRoutes']) - 3} more)"
+            key_routes = join_truncated(rt['KeyRoutes'], '; ') or 'Local only'
 
             rows.append([
                 rt['RouteTableId'],
@@ -98,84 +218,36 @@ class MarkdownFormatter:
                 key_routes
             ])
 
-        return self.format_table(headers, rows)
+        self.format_table(ROUTE_TABLE_HEADERS, rows, out=out)
 
-    def format_internet_gateways(self, igws: List[Dict[str, Any]]) -> str:
+    @writes_markdown
+    def format_internet_gateways(self, igws: List[Dict[str, Any]], *, out: TextIO):
         """Format Internet Gateway information."""
-        headers = ["IGW ID", "Name", "State", "Attached VPC"]
-        rows = []
-
-        for igw in igws:
-            rows.append([
-                igw['InternetGatewayId'],
-                igw['Name'] or '(unnamed)',
-                igw['State'],
-                igw['AttachedVpc']
-            ])
+        self.format_section('internet_gateways', igws, out=out)
 
-        return self.format_table(headers, rows)
-
-    def format_nat_gateways(self, nat_gws: List[Dict[str, Any]]) -> str:
+    @writes_markdown
+    def format_nat_gateways(self, nat_gws: List[Dict[str, Any]], *, out: TextIO):
         """Format NAT Gateway information."""
-        headers = ["NAT Gateway ID", "Name", "VPC", "Subnet", "State", "Public IP", "Private IP"]
-        rows = []
-
-        for nat in nat_gws:
-            rows.append([
-                nat['NatGatewayId'],
-                nat['Name'] or '(unnamed)',
-                nat['VpcId'],
-                nat['SubnetId'],
-                nat['State'],
-                nat['PublicIp'],
-                nat['PrivateIp']
-            ])
-
-        return self.format_table(headers, rows)
+        self.format_section('nat_gateways', nat_gws, out=out)
 
-    def format_transit_gateways(self, tgws: List[Dict[str, Any]]) -> str:
+    @writes_markdown
+    def format_transit_gateways(self, tgws: List[Dict[str, Any]], *, out: TextIO):
         """Format Transit Gateway information."""
-        headers = ["TGW ID", "Name", "State", "ASN", "Default Route Table"]
-        rows = []
-
-        for tgw in tgws:
-            rows.append([
-                tgw['TransitGatewayId'],
-                tgw['Name'] or '(unnamed)',
-                tgw['State'],
-                str(tgw['AmazonSideAsn']),
-                tgw['DefaultRouteTableId']
-            ])
+        self.format_section('transit_gateways', tgws, out=out)
 
-        return self.format_table(headers, rows)
-
-    def format_vpn_gateways(self, vgws: List[Dict[str, Any]]) -> str:
+    @writes_markdown
+    def format_vpn_gateways(self, vgws: List[Dict[str, Any]], *, out: TextIO):
         """Format VPN Gateway information."""
-        headers = ["VGW ID", "Name", "State", "Type", "ASN", "Attached VPC"]
-        rows = []
+        self.format_section('vpn_gateways', vgws, out=out)
 
-        for vgw in vgws:
-            rows.append([
-                vgw['VpnGatewayId'],
-                vgw['Name'] or '(unnamed)',
-                vgw['State'],
-                vgw['Type'],
-                str(vgw['AmazonSideAsn']),
-                vgw['AttachedVpc']
-            ])
-
-        return self.format_table(headers, rows)
-
-    def format_security_groups(self, sgs: List[Dict[str, Any]], limit: int = 20) -> str:
+    @writes_markdown
+    def format_security_groups(self, sgs: List[Dict[str, Any]], limit: int = 20, *, out: TextIO):
         """Format Security Group information (limited to most relevant)."""
-        headers = ["SG ID", "Name", "VPC", "Key Inbound Rules"]
         rows = []
 
         # Show only first N security groups
         for sg in sgs[:limit]:
-            inbound = '; '.join(sg['InboundRules'][:3]) if sg['InboundRules'] else 'None'
-            if len(sg['InboundRules']) > 3:
-                inbound += f" (+{len(sg['InboundRules']) - 3} more)"
+            inbound = join_truncated(sg['InboundRules'], '; ') or 'None'
 
             rows.append([
                 sg['GroupId'],
@@ -184,16 +256,14 @@ class MarkdownFormatter:
                 inbound
             ])
 
-        result = self.format_table(headers, rows)
+        self.format_table(SECURITY_GROUP_HEADERS, rows, out=out)
 
         if len(sgs) > limit:
-            result += f"\nNote: There are {len(sgs)} total security groups. The table above shows the first {limit}.\n"
+            out.write(f"\nNote: There are {len(sgs)} total security groups. The table above shows the first {limit}.\n")
 
-        return result
-
-    def format_network_acls(self, nacls: List[Dict[str, Any]]) -> str:
+    @writes_markdown
+    def format_network_acls(self, nacls: List[Dict[str, Any]], *, out: TextIO):
         """Format Network ACL information."""
-        headers = ["NACL ID", "VPC", "Subnets", "Type", "Rules"]
         rows = []
 
         for nacl in nacls:
@@ -210,62 +280,39 @@ class MarkdownFormatter:
                 rules
             ])
 
-        result = self.format_table(headers, rows)
-        result += "\nNote: All NACLs follow standard rule format (Rule 100: Allow all, Rule 32767: Deny all as default).\n"
-
-        return result
+        self.format_table(NETWORK_ACL_HEADERS, rows, out=out)
+        out.write("\nNote: All NACLs follow standard rule format (Rule 100: Allow all, Rule 32767: Deny all as default).\n")
 
-    def format_vpc_peering(self, peerings: List[Dict[str, Any]]) -> str:
+    @writes_markdown
+    def format_vpc_peering(self, peerings: List[Dict[str, Any]], *, out: TextIO):
         """Format VPC Peering Connection information."""
-        headers = ["Peering Connection ID", "Name", "Requester VPC", "Accepter VPC", "Status"]
-        rows = []
-
-        for peer in peerings:
-            rows.append([
-                peer['VpcPeeringConnectionId'],
-                peer['Name'] or '(unnamed)',
-                peer['RequesterVpc'],
-                peer['AccepterVpc'],
-                peer['Status']
-            ])
+        self.format_section('vpc_peering', peerings, out=out)
 
-        return self.format_table(headers, rows)
-
-    def format_vpc_endpoints(self, endpoints: List[Dict[str, Any]]) -> str:
+    @writes_markdown
+    def format_vpc_endpoints(self, endpoints: List[Dict[str, Any]], *, out: TextIO):
         """Format VPC Endpoint information."""
-        headers = ["Endpoint ID", "Name", "Type", "VPC", "Service", "State"]
-        rows = []
-
-        for endpoint in endpoints:
-            # Shorten service name for readability
-            service = endpoint['ServiceName'].replace('com.amazonaws.', '')
-
-            rows.append([
-                endpoint['VpcEndpointId'],
-                endpoint['Name'] or '(unnamed)',
-                endpoint['VpcEndpointType'],
-                endpoint['VpcId'],
-                service,
-                endpoint['State']
-            ])
+        self.format_section('vpc_endpoints', endpoints, out=out)
 
-        return self.format_table(headers, rows)
-
-    def format_ec2_instances(self, instances: List[Dict[str, Any]]) -> str:
+    @writes_markdown
+    def format_ec2_instances(self, instances: List[Dict[str, Any]], *, out: TextIO):
         """Format EC2 instance information."""
-        headers = ["Instance ID", "Name", "Type", "State", "VPC", "Subnet", "Private IP", "Public IP", "NAT Instance"]
         rows = []
+        nat_count = 0
 
         for instance in instances:
             # Show only running, stopped, or stopping instances (skip terminated)
-            if instance['State'] in ['terminated', 'terminating']:
+            if instance['State'] in TERMINATED_STATES:
                 continue
 
-            nat_indicator = 'Yes' if instance['IsNatInstance'] else 'No'
+            if instance['IsNatInstance']:
+                nat_count += 1
+                nat_indicator = 'Yes'
+            else:
+                nat_indicator = 'No'
 
             rows.append([
                 instance['InstanceId'],
-                instance['Name'] or '(unnamed)',
+                instance['Name'] or UNNAMED,
                 instance['InstanceType'],
                 instance['State'],
                 instance['VpcId'],
@@ -276,133 +323,110 @@ class MarkdownFormatter:
             ])
 
         if not rows:
-            return "_No EC2 instances found (excluding terminated instances)_\n"
+            out.write("_No EC2 instances found (excluding terminated instances)_\n")
+            return
 
-        result = self.format_table(headers, rows)
+        self.format_table(EC2_INSTANCE_HEADERS, rows, out=out)
 
         # Add note about NAT instances
-        nat_instances = [i for i in instances if i['IsNatInstance'] and i['State'] not in ['terminated', 'terminating']]
-        if nat_instances:
-            result += f"\nNote: {len(nat_instances)} NAT instance(s) detected (source/destination check disabled).\n"
-
-        return result
+        if nat_count:
+            out.write(f"\nNote: {nat_count} NAT instance(s) detected (source/destination check disabled).\n")
 
-    def format_direct_connect(self, dx_data: Dict[str, Any]) -> str:
+    @writes_markdown
+    def format_direct_connect(self, dx_data: Dict[str, Any], *, out: TextIO):
         """Format Direct Connect information."""
-        output = []
+        if not (dx_data['connections'] or dx_data['virtual_interfaces'] or dx_data['dx_gateways']):
+            out.write("_No Direct Connect resources found_\n")
+            return
+
+        # Subsections are separated by a blank line
+        separator = ""
 
         # Connections
         if dx_data['connections']:
-            output.append("### Direct Connect Connections\n")
-            headers = ["Connection ID", "Name", "State", "Location", "Bandwidth", "AWS Device"]
+            out.write("### Direct Connect Connections\n\n")
             rows = []
             for conn in dx_data['connections']:
                 rows.append([
                     conn['connectionId'],
-                    conn.get('connectionName', '(unnamed)'),
+                    conn.get('connectionName', UNNAMED),
                     conn['connectionState'],
                     conn['location'],
                     conn['bandwidth'],
                     conn.get('awsDeviceV2', 'N/A')
                 ])
-            output.append(self.format_table(headers, rows))
+            self.format_table(DX_CONNECTION_HEADERS, rows, out=out)
+            separator = "\n"
 
         # Virtual Interfaces
         if dx_data['virtual_interfaces']:
-            output.append("### Virtual Interfaces (VIFs)\n")
-            headers = ["VIF ID", "Name", "Type", "VLAN", "State", "BGP Status", "Customer ASN"]
+            out.write(separator + "### Virtual Interfaces (VIFs)\n\n")
             rows = []
             for vif in dx_data['virtual_interfaces']:
                 rows.append([
                     vif['virtualInterfaceId'],
-                    vif.get('virtualInterfaceName', '(unnamed)'),
+                    vif.get('virtualInterfaceName', UNNAMED),
                     vif['virtualInterfaceType'],
                     str(vif['vlan']),
                     vif['virtualInterfaceState'],
                     vif.get('bgpStatus', 'N/A'),
                     str(vif.get('customerAsn', 'N/A'))
                 ])
-            output.append(self.format_table(headers, rows))
+            self.format_table(DX_VIF_HEADERS, rows, out=out)
+            separator = "\n"
 
         # DX Gateways
         if dx_data['dx_gateways']:
-            output.append("### Direct Connect Gateways\n")
-            headers = ["DX Gateway ID", "Name", "State", "ASN"]
+            out.write(separator + "### Direct Connect Gateways\n\n")
             rows = []
             for gw in dx_data['dx_gateways']:
                 rows.append([
                     gw['directConnectGatewayId'],
-                    gw.get('directConnectGatewayName', '(unnamed)'),
+                    gw.get('directConnectGatewayName', UNNAMED),
                     gw['directConnectGatewayState'],
                     str(gw['amazonSideAsn'])
                 ])
-            output.append(self.format_table(headers, rows))
-
-        return "\n".join(output) if output else "_No Direct Connect resources found_\n"
+            self.format_table(DX_GATEWAY_HEADERS, rows, out=out)
 
-    def format_all(self, data: Dict[str, Any]) -> str:
-        """Format all collected data into a complete markdown document."""
-        output = []
+    @writes_markdown
+    def format_all(self, data: Dict[str, Any], *, out: TextIO):
+        """Format all collected data into a complete markdown document.
 
+        The document is returned as a string, or written to out instead
+        when a file object is given.
+        """
         # Header
         metadata = data['metadata']
-        output.append("# AWS Network Configuration\n")
-        output.append(f"**Region:** {metadata['region']}  ")
-        output.append(f"**Date:** {metadata['date']}  ")
-        output.append(f"**Account:** {metadata['account_id']}\n")
-        output.append("---\n")
-
-        # VPCs
-        output.append("## VPCs\n")
-        output.append(self.format_vpcs(data['vpcs']))
-
-        # Subnets
-        output.append("\n## Subnets\n")
-        output.append(self.format_subnets(data['subnets']))
-
-        # Route Tables
-        output.append("\n## Route Tables\n")
-        output.append(self.format_route_tables(data['route_tables']))
-
-        # Internet Gateways
-        output.append("\n## Internet Gateways\n")
-        output.append(self.format_internet_gateways(data['internet_gateways']))
-
-        # NAT Gateways
-        output.append("\n## NAT Gateways\n")
-        output.append(self.format_nat_gateways(data['nat_gateways']))
-
-        # Transit Gateways
-        output.append("\n## Transit Gateways\n")
-        output.append(self.format_transit_gateways(data['transit_gateways']))
-
-        # VPN Gateways
-        output.append("\n## VPN Gateways\n")
-        output.append(self.format_vpn_gateways(data['vpn_gateways']))
-
-        # EC2 Instances
-        output.append("\n## EC2 Instances\n")
-        output.append(self.format_ec2_instances(data['ec2_instances']))
-
-        # Security Groups
-        output.append("\n## Security Groups\n")
-        output.append(self.format_security_groups(data['security_groups']))
-
-        # Network ACLs
-        output.append("\n## Network ACLs\n")
-        output.append(self.format_network_acls(data['network_acls']))
-
-        # VPC Peering
-        output.append("\n## VPC Peering Connections\n")
-        output.append(self.format_vpc_peering(data['vpc_peering']))
-
-        # VPC Endpoints
-        output.append("\n## VPC Endpoints\n")
-        output.append(self.format_vpc_endpoints(data['vpc_endpoints']))
+        out.write(
+            "# AWS Network Configuration\n"
+            f"**Region:** {metadata['region']}  "
+            f"**Date:** {metadata['date']}  "
+            f"**Account:** {metadata['account_id']}\n"
+            "---\n"
+        )
+
+        # Sections in document order: (heading, key in data, formatter).
+        # Each heading carries the blank line separating it from the previous section.
+        sections = [
+            ("## VPCs\n", 'vpcs', self.format_vpcs),
+            ("\n## Subnets\n", 'subnets', self.format_subnets),
+            ("\n## Route Tables\n", 'route_tables', self.format_route_tables),
+            ("\n## Internet Gateways\n", 'internet_gateways', self.format_internet_gateways),
+            ("\n## NAT Gateways\n", 'nat_gateways', self.format_nat_gateways),
+            ("\n## Transit Gateways\n", 'transit_gateways', self.format_transit_gateways),
+            ("\n## VPN Gateways\n", 'vpn_gateways', self.format_vpn_gateways),
+            ("\n## EC2 Instances\n", 'ec2_instances', self.format_ec2_instances),
+            ("\n## Security Groups\n", 'security_groups', self.format_security_groups),
+            ("\n## Network ACLs\n", 'network_acls', self.format_network_acls),
+            ("\n## VPC Peering Connections\n", 'vpc_peering', self.format_vpc_peering),
+            ("\n## VPC Endpoints\n", 'vpc_endpoints', self.format_vpc_endpoints),
+        ]
+
+        for heading, key, format_items in sections:
+            out.write(heading)
+            format_items(data[key], out=out)
 
         # Direct Connect
         if any(data['direct_connect'].values()):
-            output.append("\n## Direct Connect Configuration\n")
-            output.append(self.format_direct_connect(data['direct_connect']))
-
-        return "".join(output)
+            out.write("\n## Direct Connect Configuration\n")
+            self.format_direct_connect(data['direct_connect'], out=out)
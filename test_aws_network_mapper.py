@@ -0,0 +1,112 @@
+"""Tests for aws_network_mapper, run against stubbed AWS clients."""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from botocore.exceptions import ClientError
+
+import aws_network_mapper
+
+ACCOUNT_ID = '123456789012'
+
+# Opt-in region that isn't enabled for the account in these tests
+DISABLED_REGION = 'ap-east-1'
+
+
+def client_error(code: str, operation: str) -> ClientError:
+    """Build the ClientError botocore raises for a failed call."""
+    return ClientError({'Error': {'Code': code, 'Message': 'stubbed'}}, operation)
+
+
+class FakePaginator:
+    """Paginator returning a single empty page."""
+
+    def __init__(self, client, operation: str):
+        self.client = client
+        self.operation = operation
+
+    def paginate(self, **kwargs):
+        self.client.check_enabled(self.operation)
+        return [{}]
+
+
+class FakeClient:
+    """AWS client whose calls succeed with empty results, except in DISABLED_REGION."""
+
+    def __init__(self, service: str, region: str, calls: list):
+        self.service = service
+        self.region = region
+        self.calls = calls
+
+    def check_enabled(self, operation: str):
+        self.calls.append((self.service, self.region, operation))
+        if self.region == DISABLED_REGION:
+            # STS and EC2 report a disabled region with different codes
+            code = 'InvalidClientTokenId' if self.service == 'sts' else 'AuthFailure'
+            raise client_error(code, operation)
+
+    def get_paginator(self, operation: str) -> FakePaginator:
+        return FakePaginator(self, operation)
+
+    def get_caller_identity(self):
+        self.check_enabled('GetCallerIdentity')
+        return {'Account': ACCOUNT_ID}
+
+    def __getattr__(self, operation: str):
+        if not operation.startswith('describe_'):
+            raise AttributeError(operation)
+
+        def call(**kwargs):
+            self.check_enabled(operation)
+            return {}
+        return call
+
+
+class FakeSession:
+    """Stand-in for boto3.Session handing out FakeClients."""
+
+    def __init__(self, profile_name: str = None):
+        self.region_name = None
+        self.calls = []
+
+    def client(self, service: str, region_name: str = None, config=None) -> FakeClient:
+        return FakeClient(service, region_name or self.region_name, self.calls)
+
+
+class MainRegionsTest(unittest.TestCase):
+    """main() with --regions against stubbed AWS clients."""
+
+    def run_main(self, regions: str):
+        """Run main() for the given regions; return (session, markdown output)."""
+        session = FakeSession()
+        with tempfile.TemporaryDirectory() as tmp:
+            output = os.path.join(tmp, 'network-config.md')
+            argv = ['aws_network_mapper.py', '--regions', regions, '--output', output, '--cache-ttl', '0']
+            with mock.patch.object(aws_network_mapper.boto3, 'Session', return_value=session), \
+                    mock.patch.object(sys, 'argv', argv), \
+                    mock.patch('sys.stdout'), mock.patch('sys.stderr'):
+                aws_network_mapper.main()
+            with open(output) as f:
+                return session, f.read()
+
+    def test_disabled_region_is_skipped(self):
+        session, markdown = self.run_main(f'us-east-1,{DISABLED_REGION}')
+
+        self.assertIn('**Region:** us-east-1', markdown)
+        self.assertNotIn(DISABLED_REGION, markdown)
+        self.assertIn(f'**Account:** {ACCOUNT_ID}', markdown)
+        # The account is looked up once, outside the disabled region
+        sts_calls = [call for call in session.calls if call[0] == 'sts']
+        self.assertEqual(sts_calls, [('sts', 'us-east-1', 'GetCallerIdentity')])
+
+    def test_all_regions_disabled_fails(self):
+        with self.assertRaises(SystemExit) as raised:
+            self.run_main(DISABLED_REGION)
+        self.assertEqual(raised.exception.code, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()